@@ -10,6 +10,7 @@ from app.services.jd_extraction_helper import JobDescriptionParser
 from app.services.job_description_enhance import JobDescriptionEnhancer
 from app.services.resume_scoring import ResumeScoringService
 from app.utils.logger import Logger
+from app.utils.file_parser import close_doc_converters
 
 # Initialize Logger
 logger = Logger(__name__).get_logger()
@@ -47,6 +48,16 @@ jd_parser = JobDescriptionParser()
 job_description_enhancer = JobDescriptionEnhancer()
 resume_scoring_service = ResumeScoringService(job_description_enhancer)
 
+@app.on_event("shutdown")
+async def close_gpt_connections():
+    # All GPTService instances share one HTTP connection pool.
+    await resume_scoring_service.gpt_service.aclose()
+
+@app.on_event("shutdown")
+async def close_doc_parsers():
+    # Quit the Word instance kept alive for DOC parsing and stop the parser worker processes.
+    close_doc_converters()
+
 @app.get("/")
 async def root():
     return {"message": "Resume and JD Processing API is running!"}
@@ -101,7 +112,8 @@ async def job_description_enhance(file: UploadFile = File(...)):
 @app.post("/api/score-resumes/")
 async def score_resumes(
     files: List[UploadFile] = File(...),
-    user_input: str = Form("")  # Capture additional user input from frontend
+    user_input: str = Form(""),  # Capture additional user input from frontend
+    bulk: bool = Form(False)  # Submit to the OpenAI Batch API (cheaper); poll /api/score-resumes/batch/{batch_id} for results
 ):
     """
     Endpoint to score multiple resumes against an enhanced job description and sample candidate profiles,
@@ -113,12 +125,26 @@ async def score_resumes(
 
         resume_files = [BytesIO(await file.read()) for file in files]
         filenames = [file.filename for file in files]
-        result = await resume_scoring_service.process_bulk_resumes(resume_files, filenames, user_input)
+        result = await resume_scoring_service.process_bulk_resumes(resume_files, filenames, user_input, bulk=bulk)
         return result
     except Exception as e:
         logger.error(f"Error scoring resumes: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error scoring resumes: {str(e)}")
 
+@app.get("/api/score-resumes/batch/{batch_id}")
+async def get_batch_scores(batch_id: str):
+    """
+    Endpoint to check a bulk scoring batch submitted through /api/score-resumes/ with bulk=true.
+    Returns the batch status, plus the scoring results once the batch has completed.
+    """
+    try:
+        return await resume_scoring_service.get_batch_scoring_results(batch_id)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown scoring batch '{batch_id}'.")
+    except Exception as e:
+        logger.error(f"Error reading scoring batch '{batch_id}': {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=f"Error reading scoring batch: {str(e)}")
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting Resume and JD Processing API")
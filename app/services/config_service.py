@@ -17,6 +17,7 @@ class ConfigService:
 
         # Retrieve necessary environment variables
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        self.embedding_cache_path = os.getenv("EMBEDDING_CACHE_PATH", "embedding_cache.sqlite3")
 
         # Validate required configurations
         if not self.openai_api_key:
@@ -30,3 +31,9 @@ class ConfigService:
         Returns the OpenAI API key.
         """
         return self.openai_api_key
+
+    def get_embedding_cache_path(self):
+        """
+        Returns the path of the SQLite file used to cache text embeddings.
+        """
+        return self.embedding_cache_path
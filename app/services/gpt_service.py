@@ -1,4 +1,4 @@
-from openai import OpenAI
+from openai import AsyncOpenAI
 from app.utils.logger import Logger
 from app.models.schemas import (
     ResumeSchema, 
@@ -9,11 +9,58 @@ from app.models.schemas import (
     CandidateProfileSchemaList
 )
 from app.services.config_service import ConfigService
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import json
+import sqlite3
+import httpx
+import numpy as np
 
 # Initialize Logger
 logger = Logger(__name__).get_logger()
 
+EMBEDDING_MODEL = "text-embedding-ada-002"
+# Maximum number of inputs accepted by a single embeddings request.
+EMBEDDING_BATCH_SIZE = 2048
+# Final Batch API statuses of a batch that will never produce results.
+BATCH_FAILED_STATUSES = ("failed", "expired", "cancelled")
+
+# One HTTP/2 connection pool shared by every GPTService instance, sized for concurrent GPT and embedding calls.
+_http_client = None
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=128, max_keepalive_connections=64)
+        )
+    return _http_client
+
+def build_response_format(response_schema: Any) -> Dict[str, Any]:
+    """
+    Builds the strict json_schema response_format for a pydantic model, as used in Batch API request bodies.
+    Strict mode needs every object closed and every property listed as required; optional fields stay nullable.
+    """
+    def close_objects(node: Any) -> None:
+        if isinstance(node, dict):
+            node.pop("default", None)
+            if "properties" in node:
+                node["additionalProperties"] = False
+                node["required"] = list(node["properties"])
+            for value in node.values():
+                close_objects(value)
+        elif isinstance(node, list):
+            for value in node:
+                close_objects(value)
+
+    schema = response_schema.model_json_schema()
+    close_objects(schema)
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": response_schema.__name__, "schema": schema, "strict": True}
+    }
+
 class GPTService:
     """
     Service for interacting with OpenAI's GPT API to process resume and job description text.
@@ -24,12 +71,27 @@ class GPTService:
         """
         try:
             config = ConfigService()
-            self.openai_client = OpenAI(api_key=config.get_openai_key())
+            self.openai_client = AsyncOpenAI(api_key=config.get_openai_key(), http_client=_get_http_client())
+            # Embeddings are cached on disk so re-scoring the same JD/resume does not re-embed it.
+            self.embedding_cache = sqlite3.connect(config.get_embedding_cache_path(), check_same_thread=False)
+            self.embedding_cache.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings_fp16 (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self.embedding_cache.commit()
             logger.info("GPT service initialized successfully.")
         except Exception as e:
             logger.error(f"Failed to initialize GPT service: {str(e)}", exc_info=True)
             raise
 
+    def build_messages(self, system_prompt: str, user_prompt: str) -> List[Dict[str, str]]:
+        """
+        Builds the chat messages sent to GPT for a system/user prompt pair.
+        """
+        return [
+            {"role": "system", "content": f"{system_prompt}\n\nEnsure response follows the schema."},
+            {"role": "user", "content": f"{user_prompt}"}
+        ]
+
     async def extract_with_prompts(
         self,
         system_prompt: str,
@@ -48,14 +110,10 @@ class GPTService:
             Dict containing extracted structured information.
         """
         try:
-            # Construct the messages
-            messages = [
-                {"role": "system", "content": f"{system_prompt}\n\nEnsure response follows the schema."},
-                {"role": "user", "content": f"{user_prompt}"}
-            ]
+            messages = self.build_messages(system_prompt, user_prompt)
 
             # Make GPT API call
-            response = self.openai_client.beta.chat.completions.parse(
+            response = await self.openai_client.beta.chat.completions.parse(
                 model="gpt-4o-mini",
                 messages=messages,
                 response_format=response_schema  # ✅ Keep response_schema unchanged
@@ -72,22 +130,160 @@ class GPTService:
     async def get_text_embedding(self, text: str) -> List[float]:
         """
         Generates a numerical embedding vector for the provided text using OpenAI embeddings.
+        See get_text_embeddings for normalization and caching.
 
         Args:
             text (str): The text to embed.
 
         Returns:
-            List[float]: A numerical vector representing the embedding.
+            List[float]: A unit-norm vector representing the embedding.
+        """
+        return (await self.get_text_embeddings([text]))[0]
+
+    async def get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generates embedding vectors for several texts, sending all cache misses in one batched request.
+        Vectors are L2-normalized, so cosine similarity between two of them is a plain dot product.
+        They are cached on disk as float16, keyed on the SHA-256 of the text and the model name.
+
+        Args:
+            texts (List[str]): The texts to embed.
+
+        Returns:
+            List[List[float]]: One unit-norm vector per text, in input order (empty lists for blank texts and on failure).
         """
         try:
-            response = self.openai_client.embeddings.create(
-                model="text-embedding-ada-002",
-                input=text
+            cache_keys = [hashlib.sha256(text.encode("utf-8")).hexdigest() + EMBEDDING_MODEL for text in texts]
+            embedding_vectors: List[Any] = [None] * len(texts)
+            for index, cache_key in enumerate(cache_keys):
+                if not texts[index].strip():
+                    # The API rejects empty input, which would fail the whole batch; empty text embeds to [].
+                    embedding_vectors[index] = np.empty(0, dtype=np.float16)
+                    continue
+                cached = self.embedding_cache.execute(
+                    "SELECT vector FROM embeddings_fp16 WHERE key = ?", (cache_key,)
+                ).fetchone()
+                if cached:
+                    embedding_vectors[index] = np.frombuffer(cached[0], dtype=np.float16)
+
+            missing = [index for index, vector in enumerate(embedding_vectors) if vector is None]
+            for batch_start in range(0, len(missing), EMBEDDING_BATCH_SIZE):
+                batch = missing[batch_start:batch_start + EMBEDDING_BATCH_SIZE]
+                response = await self.openai_client.embeddings.create(
+                    model=EMBEDDING_MODEL,
+                    input=[texts[index] for index in batch]
+                )
+                for item in response.data:
+                    index = batch[item.index]
+                    embedding_vector = np.asarray(item.embedding, dtype=np.float32)
+                    embedding_vector /= np.linalg.norm(embedding_vector) + 1e-12
+                    embedding_vectors[index] = embedding_vector.astype(np.float16)
+                    self.embedding_cache.execute(
+                        "INSERT OR REPLACE INTO embeddings_fp16 (key, vector) VALUES (?, ?)",
+                        (cache_keys[index], embedding_vectors[index].tobytes())
+                    )
+                self.embedding_cache.commit()
+
+            return [embedding_vector.astype(np.float32).tolist() for embedding_vector in embedding_vectors]
+
+        except Exception as e:
+            logger.error(f"Failed to generate text embeddings: {str(e)}", exc_info=True)
+            return [[] for _ in texts]
+
+    async def submit_prompts_batch(self, prompts: List[Tuple[str, str]], response_schema: Any) -> str:
+        """
+        Submit structured extraction for many prompt pairs as one OpenAI Batch API job.
+        Batched requests are billed at half the token cost and complete within 24h, so this is
+        meant for bulk jobs where latency does not matter; collect results with get_batch_results.
+
+        Args:
+            prompts (List[Tuple[str, str]]): (system_prompt, user_prompt) pairs.
+            response_schema (Any): Expected schema for every response.
+
+        Returns:
+            str: The id of the submitted batch.
+        """
+        try:
+            response_format = build_response_format(response_schema)
+            batch_lines = [
+                json.dumps({
+                    "custom_id": f"request-{index}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": "gpt-4o-mini",
+                        "messages": self.build_messages(system_prompt, user_prompt),
+                        "response_format": response_format
+                    }
+                })
+                for index, (system_prompt, user_prompt) in enumerate(prompts)
+            ]
+
+            batch_file = await self.openai_client.files.create(
+                file=("batch_requests.jsonl", "\n".join(batch_lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = await self.openai_client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
             )
+            logger.info(f"Submitted GPT batch '{batch.id}' with {len(prompts)} request(s).")
+            return batch.id
+
+        except Exception as e:
+            logger.error(f"GPT batch submission failed: {str(e)}", exc_info=True)
+            raise Exception(f"GPT batch submission failed: {str(e)}")
+
+    async def get_batch_results(
+        self,
+        batch_id: str,
+        response_schema: Any,
+        request_count: int
+    ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+        """
+        Check a batch submitted with submit_prompts_batch and read its results once it has completed.
+
+        Args:
+            batch_id (str): The id returned by submit_prompts_batch.
+            response_schema (Any): Expected schema for every response.
+            request_count (int): Number of prompt pairs in the batch.
+
+        Returns:
+            Tuple of (status, results). Results are None until the batch has completed, including when
+            it ended in one of BATCH_FAILED_STATUSES; otherwise one dict per prompt pair in submission order.
+        """
+        try:
+            batch = await self.openai_client.batches.retrieve(batch_id)
+            if batch.status != "completed":
+                return batch.status, None
+            if not batch.output_file_id:
+                raise Exception(f"Batch '{batch_id}' completed without an output file")
+
+            results: List[Any] = [None] * request_count
+            output = (await self.openai_client.files.content(batch.output_file_id)).text
+            for line in output.splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                index = int(record["custom_id"].split("-")[1])
+                response = record.get("response") or {}
+                if response.get("status_code") != 200:
+                    raise Exception(f"Batch request {record['custom_id']} failed: {record.get('error') or response}")
+                content = response["body"]["choices"][0]["message"]["content"]
+                results[index] = response_schema.model_validate_json(content).dict()
 
-            embedding_vector = response.data[0].embedding
-            return embedding_vector
+            missing = [index for index, result in enumerate(results) if result is None]
+            if missing:
+                raise Exception(f"Batch '{batch_id}' returned no result for request(s) {missing}")
+            return batch.status, results
 
         except Exception as e:
-            logger.error(f"Failed to generate text embedding: {str(e)}", exc_info=True)
-            return []
\ No newline at end of file
+            logger.error(f"GPT batch extraction failed: {str(e)}", exc_info=True)
+            raise Exception(f"GPT batch extraction failed: {str(e)}")
+
+    async def aclose(self):
+        """
+        Closes the shared HTTP connection pool. Call once on application shutdown.
+        """
+        await self.openai_client.close()
@@ -5,6 +5,7 @@ from io import BytesIO
 from app.utils.logger import Logger
 from app.models.schemas import JobDescriptionSchema
 from datetime import datetime
+import asyncio
 
 logger = Logger(__name__).get_logger()
 
@@ -31,7 +32,7 @@ class JobDescriptionParser:
             Dict containing structured job description data.
         """
         try:
-            text = parse_pdf_or_docx(file_buffer, filename)
+            text = await asyncio.to_thread(parse_pdf_or_docx, file_buffer, filename)
             today_date = datetime.now().strftime("%Y-%m-%d")
 
             # System Prompt
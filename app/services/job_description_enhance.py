@@ -7,15 +7,11 @@ from io import BytesIO
 from app.utils.logger import Logger
 from app.models.schemas import EnhancedJobDescriptionSchema, CandidateProfileSchemaList, JobDescriptionSchema
 from datetime import datetime
+import asyncio
 import numpy as np
 
 logger = Logger(__name__).get_logger()
 
-def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
-    if not np.any(vec1) or not np.any(vec2):
-        return 0.0
-    return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
-
 class JobDescriptionEnhancer:
     """
     Service for extracting and enhancing job descriptions, generating sample candidate profiles,
@@ -135,7 +131,8 @@ class JobDescriptionEnhancer:
             vectorized_jd = await self.vectorize_job_description(enhanced_jd)
             self.temp_storage["enhanced_job_description"] = enhanced_jd
             self.temp_storage["candidates"] = candidates
-            self.temp_storage["vectorized_jd"] = vectorized_jd
+            # Held as float16 for the lifetime of the JD; similarity math upcasts to float32.
+            self.temp_storage["vectorized_jd"] = np.asarray(vectorized_jd, dtype=np.float16)
             return {
                 "enhanced_job_description": enhanced_jd,
                 "generated_candidates": candidates,
@@ -147,7 +144,7 @@ class JobDescriptionEnhancer:
 
     async def extract_job_description(self, file_buffer: BytesIO, filename: str) -> Dict[str, Any]:
         try:
-            text = parse_pdf_or_docx(file_buffer, filename)
+            text = await asyncio.to_thread(parse_pdf_or_docx, file_buffer, filename)
             today_date = datetime.now().strftime("%Y-%m-%d")
             system_prompt = f"""
             You are an AI model specialized in extracting structured job descriptions. 
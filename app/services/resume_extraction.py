@@ -5,6 +5,7 @@ from io import BytesIO
 from app.utils.logger import Logger
 from app.models.schemas import ResumeSchema
 from datetime import datetime
+import asyncio
 from typing import List, Dict
 
 logger = Logger(__name__).get_logger()
@@ -32,7 +33,7 @@ class ResumeParser:
             Dict containing structured resume data.
         """
         try:
-            text = parse_pdf_or_docx(file_buffer, filename)
+            text = await asyncio.to_thread(parse_pdf_or_docx, file_buffer, filename)
             today_date = datetime.now().strftime("%Y-%m-%d")
 
             
@@ -1,20 +1,177 @@
-from app.utils.file_parser import parse_pdf_or_docx
-from app.services.gpt_service import GPTService
+from app.utils.file_parser import parse_pdf_or_docx, parse_many
+from app.services.gpt_service import GPTService, BATCH_FAILED_STATUSES
 from app.services.config_service import ConfigService
 from app.services.neo4j_service import Neo4jService
 from io import BytesIO
 from app.utils.logger import Logger
 from app.models.schemas import ResumeSchema, ResumeScoringSchema
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
+from functools import lru_cache
+import asyncio
+import orjson
 import numpy as np
+import tiktoken
 
 logger = Logger(__name__).get_logger()
 
-def cosine_similarity(vec1: np.ndarray, vec2: np.ndarray) -> float:
-    if not np.any(vec1) or not np.any(vec2):
-        return 0.0
-    return float(np.dot(vec1, vec2) / (np.linalg.norm(vec1) * np.linalg.norm(vec2)))
+# Resume text sent to GPT is capped at this many tokens, keeping the head and the tail.
+MAX_RESUME_TOKENS = 6000
+RESUME_HEAD_TOKENS = 5000
+RESUME_TAIL_TOKENS = 1000
+
+# Number of resumes extracted (file parsing + GPT extraction) concurrently across all requests.
+MAX_CONCURRENT_EXTRACTIONS = 8
+# Number of resumes scored concurrently while the next resumes are still being extracted.
+MAX_CONCURRENT_SCORINGS = 4
+
+@lru_cache(maxsize=1)
+def _get_token_encoder():
+    # o200k_base is the tokenizer used by gpt-4o-mini.
+    return tiktoken.get_encoding("o200k_base")
+
+def truncate_resume_text(text: str) -> str:
+    """
+    Trims resume text longer than MAX_RESUME_TOKENS to its first and last tokens.
+    """
+    encoder = _get_token_encoder()
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= MAX_RESUME_TOKENS:
+        return text
+    logger.info(f"Truncating resume text from {len(tokens)} to {MAX_RESUME_TOKENS} tokens.")
+    return encoder.decode(tokens[:RESUME_HEAD_TOKENS] + tokens[-RESUME_TAIL_TOKENS:])
+
+# Prompt templates are built once at import; only the dynamic fields are substituted per call.
+_PARSE_SYS_TEMPLATE = """
+You are an AI model specializing in extracting structured information from resumes.
+Parse the text and produce a JSON structure with these top-level fields, each of the following keys must be present:
+1) candidate_name (string) — Full name, ensure spaces between first and last names if applicable.
+2) email_address (string) - The email should be a valid email address with a "@" symbol and a domain name (gmail, outlook, etc..).
+3) phone_number (string) - should be a valid phone number with country codes (default is +91 if none given) first, followed by a space and then the number.
+4) work_experience (object containing 'years' (number) and 'months' (number)) - Ensure that overlapping work periods are handled correctly.
+5) educations_duration (object containing 'years' (number) and 'months' (number)) — Calculate the correct total duration for education.
+6) experiences (array of objects):
+    Each experience must include:
+    - title (string),
+    - company (string),
+    - description (string),
+    - date_start (string),
+    - date_end (string),
+    - skills (array of strings),
+    - tasks (array of strings)
+7) educations (array of objects):
+    - institution (string),
+    - title (string),
+    - date_start (string),
+    - date_end (string),
+    - skills (string),
+    - tasks (string)
+8) social_urls (array of objects, each with:
+    - type (string),
+    - url (string)
+9) languages (array of objects, each with:
+    - name (string)
+10) skills (object containing 'primary_skills' (array of strings) and 'secondary_skills' (array of strings))
+
+11) certifications (array of objects, each with:
+    - name (string) any sort of online or offline certification or courses done by the candidate.
+
+Key instructions for duration calculations:
+- Calculate work_experience and educations_duration based on the start and end dates. Ensure that consecutive periods (without gaps) are treated as distinct and add up the durations without including the gap between roles.
+- If "present," "ongoing," "current," or similar terms are mentioned, then use today's date {today_date} as the date_end and calculate the duration accordingly.
+"""
+
+_PARSE_USER_TEMPLATE = """
+Extract structured information from this resume text:
+{text}
+Follow these instructions:
+1. Parse the text and extract structured information according to the keys mentioned above.
+2. Ensure that the total work experience is calculated accurately by accounting for overlaps and distinct periods.
+3. Handle ongoing periods by comparing "present" with today's date and calculating the accurate duration.
+4. For overlapping roles, calculate the total unique time worked without double-counting.
+5. For education durations, calculate accurately.
+6. Ensure no missing fields, and if any information is not provided, use null or empty arrays.
+7. Return a valid JSON output with accurate dates and durations.
+8. If no skills are explicitly or less than 10 are mentioned in the resume, generate a total of 10 relevant skills based on the candidate's experience and education.
+"""
+
+_SCORING_SYS = """
+You are an AI tasked with evaluating resumes in relation to an user input (more priority), enhanced job description (second priority) and a set of sample candidates. The candidate's resume should be analyzed thoroughly, including both technical and non-technical aspects, and compared with the job description as well as the dummy candidates.
+
+Your task is to perform a deep analysis of the candidate's resume and compare it to both the enhanced job description and the sample candidates. Every detail in the resume should be examined carefully, including skills, experiences, education, certifications, and any other relevant information. You need to assess the alignment of the candidate's profile with the job description and the sample candidates.
+
+The analysis should include:
+- Identification of any missing skills or experience gaps.
+- A detailed summary of what the candidate possesses in terms of qualifications, expertise, and suitability for the role.
+- A comparison of the candidate to the closest matching sample candidate from the generated set.
+- Recommendations for improvement to help the candidate better match the job description.
+
+**Scoring Criteria:**
+1. **Skill Match**: Assess both technical and soft skills mentioned in the resume.
+2. **Experience Relevance**: Evaluate how well the candidate's past roles and industry experience align with the job description and sample candidates.
+3. **Education & Certifications**: Check if the candidate's education and certifications match the requirements of the job description.
+4. **Keyword Similarity**: Analyze the ATS (Applicant Tracking System) optimization by checking how well the resume matches keywords in the job description.
+
+**Output Format:**
+- **candidate_name**: Name of the candidate extracted from the resume.
+- **resume_score**: A score assigned to the resume on a scale from 0 to 10 based on how well it aligns with the job description and sample candidates.
+- **gap_analysis**: A list of missing skills or experience gaps identified in the candidate's resume.
+- **candidate_summary**: A detailed summary of the candidate's qualifications, experience, and suitability for the job.
+- **recommendations**: A set of recommendations for the candidate to improve their alignment with the job description.
+
+Your task is to analyze the candidate's resume carefully in relation to the enhanced job description and the sample candidates, and generate the report accordingly.
+
+Enhanced Job Description + User Input + Sample Candidates:
+"""
+
+_SCORING_USER_TEMPLATE = """
+Evaluate the following resume against the **Enhanced Job Description** and **Sample Candidates**.
+
+Resume details: {resume_json}
+
+Matching Candidates:
+{similar_candidates_info}
+"""
+
+def _merge_intervals(starts: np.ndarray, ends: np.ndarray) -> int:
+    """
+    Sums the months covered by (start, end) month intervals sorted by start, counting overlaps once.
+    """
+    # An interval that ends before it starts covers no time.
+    ends = np.maximum(ends, starts)
+    running_end = np.maximum.accumulate(ends)
+    # A new merged block begins wherever an interval starts after everything before it has ended.
+    block_starts = np.flatnonzero(starts[1:] > running_end[:-1]) + 1
+    first = np.concatenate(([0], block_starts))
+    last = np.concatenate((block_starts - 1, [starts.size - 1]))
+    return int(np.sum(running_end[last] - starts[first]))
+
+def _resume_to_text(resume: Dict[str, Any]) -> str:
+    """
+    Flattens the skills and the experience and education titles and descriptions of an extracted
+    resume into one plain string, so embeddings see words rather than dict/list punctuation.
+    """
+    skills = resume.get('skills') or {}
+    parts = (skills.get('primary_skills') or []) + (skills.get('secondary_skills') or [])
+    for experience in resume.get('experiences') or []:
+        parts.extend([experience.get('title'), experience.get('description')])
+    for education in resume.get('educations') or []:
+        parts.extend([education.get('title'), education.get('description')])
+    return ' '.join(part for part in parts if part)
+
+@lru_cache(maxsize=4096)
+def _parse_month_index(date_string: str) -> int:
+    # Only valid dates are cached; invalid ones raise and fall back to the current month in parse_date.
+    try:
+        year = int(date_string[0:4])
+        month = int(date_string[5:7])
+        if date_string[4] == '-' and 1 <= month <= 12:
+            return year * 12 + month
+    except ValueError:
+        pass
+    # Slicing only handles zero-padded dates; let strptime read the rest (e.g. "2020-5-1").
+    parsed_date = datetime.strptime(date_string, "%Y-%m-%d")
+    return parsed_date.year * 12 + parsed_date.month
 
 class ResumeScoringService:
     """
@@ -27,6 +184,9 @@ class ResumeScoringService:
         self.gpt_service = GPTService()
         self.job_description_enhancer = job_description_enhancer
         self.neo4j_service = Neo4jService()
+        self.extraction_slots = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTIONS)
+        # Bulk scoring batches submitted to the OpenAI Batch API, by batch id.
+        self.scoring_batches: Dict[str, Dict[str, Any]] = {}
 
     def map_experience_to_bucket(self, years: int) -> str:
         if years < 1:
@@ -72,16 +232,20 @@ class ResumeScoringService:
             })
         return mapping
 
-    async def process_bulk_resumes(self, resume_files: List[BytesIO], filenames: List[str], user_input: str) -> List[Dict[str, Any]]:
+    async def process_bulk_resumes(self, resume_files: List[BytesIO], filenames: List[str], user_input: str, bulk: bool = False) -> Any:
         """
         Processes multiple uploaded resumes:
          - Parses and scores each resume (overall resume score)
          - Creates candidate nodes using fixed Industry 'Finances' and Job Role 'Risk Advisory & Internal Auditor'
          - Uses conditional linking: if a candidate’s skill mapping returns non‑empty subskills then the candidate is linked to each SubSkill node;
            otherwise, the candidate is linked directly to the Skill node.
-         - Retrieves stored candidates for the fixed job role and detailed matching candidate–skill information,
-           and appends these details to the combined criteria.
-         - Returns a list of scoring results for each resume.
+         - Retrieves stored candidates for the fixed job role once per run and detailed matching candidate–skill
+           information per resume. The criteria shared by every resume go into the system prompt so that
+           OpenAI's prompt caching can reuse them; only the resume-specific details go into the user prompt.
+         - When bulk is True, all scoring prompts are submitted together through the OpenAI Batch API
+           instead of one interactive GPT call per resume, and the batch id is returned at once;
+           results are read later with get_batch_scoring_results.
+         - Otherwise returns a list of scoring results for each resume.
         """
         try:
             if "enhanced_job_description" not in self.job_description_enhancer.temp_storage:
@@ -95,68 +259,235 @@ class ResumeScoringService:
             self.neo4j_service.add_industry(fixed_industry)
             self.neo4j_service.add_job_role(fixed_industry, fixed_job_role)
 
-            results = []
-
-            for file_buffer, filename in zip(resume_files, filenames):
-                extracted_resume = await self.parse_resume(file_buffer, filename)
-                candidate_name = extracted_resume.get("candidate_name", "Unknown")
-                experience_years = extracted_resume.get("work_experience", {}).get("years", 0)
-                experience_bucket = self.map_experience_to_bucket(experience_years)
-
-                self.neo4j_service.create_experience_node(experience_bucket)
-
-                stored_candidates = self.neo4j_service.find_candidates_for_job_role(fixed_job_role)
-
-                primary_skills = extracted_resume.get("skills", {}).get("primary_skills", [])
-                secondary_skills = extracted_resume.get("skills", {}).get("secondary_skills", [])
-                combined_mapping = self.map_skills_to_conditional(primary_skills, secondary_skills)
-
-                similar_candidates_info = ""
-                # For each skill mapping entry, get detailed similar candidate info.
-                for mapping_entry in combined_mapping:
-                    skill_name = mapping_entry['skill']
-                    if mapping_entry['subskills']:
-                        for subskill_entry in mapping_entry['subskills']:
-                            subskill_name = subskill_entry['subskill']
-                            # Use a new method that returns detailed matching candidate info.
-                            similar = self.neo4j_service.find_matching_candidates(experience_bucket, skill_name, subskill_name)
-                            similar_candidates_info += f"Skill: {skill_name}, SubSkill: {subskill_name}, Matches: {similar}\n"
-                    else:
-                        similar = self.neo4j_service.find_candidates_for_same_experience_skill(experience_bucket, skill_name)
-                        similar_candidates_info += f"Skill: {skill_name}, Matches: {similar}\n"
-
-                combined_criteria = f"{user_input}\n\n{enhanced_jd}\n\n{generated_candidates}\n\nStored Candidates: {stored_candidates}\nSimilar Candidates Info:\n{similar_candidates_info}"
-                resume_scoring = await self.score_resume(extracted_resume, combined_criteria, generated_candidates)
-                overall_resume_score = resume_scoring.get("resume_score", 0)
-
-                self.neo4j_service.create_candidate(candidate_name, overall_resume_score)
-
-                # Conditional linking: if subskills exist for a mapping, link candidate to each subskill node;
-                # otherwise, link candidate directly to the Skill node.
-                for mapping_entry in combined_mapping:
-                    skill_name = mapping_entry['skill']
-                    self.neo4j_service.add_skill(experience_bucket, skill_name)
-                    if mapping_entry['subskills']:
-                        for subskill_entry in mapping_entry['subskills']:
-                            subskill_name = subskill_entry['subskill']
-                            self.neo4j_service.create_subskill_under_skill(experience_bucket, skill_name, subskill_name)
-                        for subskill_entry in mapping_entry['subskills']:
-                            subskill_name = subskill_entry['subskill']
-                            self.neo4j_service.link_candidate_to_subskill(candidate_name, subskill_name)
-                    else:
-                        self.neo4j_service.link_candidate_to_skill(candidate_name, skill_name)
-
-                similarity = await self.compute_similarity(extracted_resume, enhanced_jd)
-                resume_scoring["cosine_similarity"] = similarity
-
-                results.append(resume_scoring)
+            stored_candidates = self.neo4j_service.find_candidates_for_job_role(fixed_job_role)
+            shared_criteria = self.build_shared_criteria(user_input, enhanced_jd, generated_candidates, stored_candidates)
+            # The JD embedding is computed once when the JD is enhanced; only resumes are embedded here.
+            jd_embedding = np.asarray(self.job_description_enhancer.temp_storage.get("vectorized_jd", []), dtype=np.float16)
 
+            if bulk:
+                return await self.process_resumes_in_batch(resume_files, filenames, shared_criteria, jd_embedding)
+
+            extracted_resumes, results = await self.process_resumes_pipelined(resume_files, filenames, shared_criteria)
+            await self.attach_similarities(extracted_resumes, results, jd_embedding)
             return results
 
         except Exception as e:
             logger.error(f"Error processing resumes: {str(e)}", exc_info=True)
             raise
 
+    async def process_resumes_pipelined(
+        self,
+        resume_files: List[BytesIO],
+        filenames: List[str],
+        shared_criteria: str
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Extracts and scores resumes as a two-stage pipeline: resumes are extracted concurrently and each
+        one is queued for scoring as soon as it is ready, while the remaining extractions continue.
+        The bounded queue applies back-pressure so extraction never runs far ahead of scoring.
+
+        Returns:
+            Tuple of (extracted resumes, scoring results), both in upload order.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2 * MAX_CONCURRENT_SCORINGS)
+        extracted_resumes: List[Any] = [None] * len(resume_files)
+        results: List[Any] = [None] * len(resume_files)
+        errors = []
+
+        async def score_worker():
+            while True:
+                index, extracted_resume = await queue.get()
+                try:
+                    scoring_context = self.build_scoring_context(extracted_resume)
+                    resume_scoring = await self.score_resume(
+                        extracted_resume, shared_criteria, scoring_context["similar_candidates_info"]
+                    )
+                    self.store_scored_resume(scoring_context, resume_scoring)
+                    results[index] = resume_scoring
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    queue.task_done()
+
+        async def extract(index: int, file_buffer: BytesIO, filename: str):
+            extracted_resume = await self.parse_resume_limited(file_buffer, filename)
+            extracted_resumes[index] = extracted_resume
+            await queue.put((index, extracted_resume))
+
+        workers = [asyncio.create_task(score_worker()) for _ in range(MAX_CONCURRENT_SCORINGS)]
+        extractions = [
+            asyncio.create_task(extract(index, file_buffer, filename))
+            for index, (file_buffer, filename) in enumerate(zip(resume_files, filenames))
+        ]
+        try:
+            await asyncio.gather(*extractions)
+            await queue.join()
+        finally:
+            for task in extractions + workers:
+                task.cancel()
+            await asyncio.gather(*extractions, *workers, return_exceptions=True)
+
+        if errors:
+            raise errors[0]
+        return extracted_resumes, results
+
+    async def process_resumes_in_batch(
+        self,
+        resume_files: List[BytesIO],
+        filenames: List[str],
+        shared_criteria: str,
+        jd_embedding: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Submits the scoring of all resumes as a single OpenAI Batch API job and returns right away.
+        Resumes are parsed and their scoring prompts collected first; the batch can take up to 24h,
+        so results are collected later through get_batch_scoring_results.
+        """
+        # Parse every file up front: PDF/DOCX files in worker processes, images in batched OCR runs.
+        resume_texts = await asyncio.to_thread(parse_many, list(zip(resume_files, filenames)))
+        extracted_resumes = await asyncio.gather(*[
+            self.extract_resume_limited(resume_text) for resume_text in resume_texts
+        ])
+        scoring_contexts = [self.build_scoring_context(extracted_resume) for extracted_resume in extracted_resumes]
+
+        prompts = [
+            self.build_scoring_prompts(extracted_resume, shared_criteria, scoring_context["similar_candidates_info"])
+            for extracted_resume, scoring_context in zip(extracted_resumes, scoring_contexts)
+        ]
+        batch_id = await self.gpt_service.submit_prompts_batch(prompts=prompts, response_schema=ResumeScoringSchema)
+
+        self.scoring_batches[batch_id] = {
+            "extracted_resumes": extracted_resumes,
+            "scoring_contexts": scoring_contexts,
+            "jd_embedding": jd_embedding,
+            "results": None
+        }
+        return {"batch_id": batch_id, "status": "submitted"}
+
+    async def get_batch_scoring_results(self, batch_id: str) -> Dict[str, Any]:
+        """
+        Returns the status of a bulk scoring batch and, once it has completed, its scoring results.
+        Candidates are stored in Neo4j the first time the completed results are read.
+
+        Raises:
+            KeyError: If no batch with this id was submitted by this service.
+            Exception: If the batch failed, expired or was cancelled, or its results could not be read.
+        """
+        scoring_batch = self.scoring_batches[batch_id]
+        if scoring_batch["results"] is not None:
+            return {"batch_id": batch_id, "status": "completed", "results": scoring_batch["results"]}
+
+        # Errors reading the batch (e.g. network failures) reach the caller, and the batch can be polled again.
+        status, resume_scorings = await self.gpt_service.get_batch_results(
+            batch_id,
+            response_schema=ResumeScoringSchema,
+            request_count=len(scoring_batch["scoring_contexts"])
+        )
+        if status in BATCH_FAILED_STATUSES:
+            # The batch will never produce results, so it is forgotten.
+            self.scoring_batches.pop(batch_id, None)
+            raise Exception(f"Scoring batch '{batch_id}' ended with status '{status}'")
+        if resume_scorings is None:
+            return {"batch_id": batch_id, "status": status}
+
+        for scoring_context, resume_scoring in zip(scoring_batch["scoring_contexts"], resume_scorings):
+            self.store_scored_resume(scoring_context, resume_scoring)
+        await self.attach_similarities(scoring_batch["extracted_resumes"], resume_scorings, scoring_batch["jd_embedding"])
+        scoring_batch.update(results=resume_scorings, extracted_resumes=None, scoring_contexts=None, jd_embedding=None)
+        return {"batch_id": batch_id, "status": status, "results": resume_scorings}
+
+    def build_shared_criteria(
+        self,
+        user_input: str,
+        enhanced_jd: Dict[str, Any],
+        generated_candidates: Dict[str, Any],
+        stored_candidates: List[str]
+    ) -> str:
+        """
+        Builds the scoring criteria shared by every resume in a run. Keys are sorted so the text is
+        byte-for-byte identical across calls and can be served from OpenAI's prompt cache.
+        """
+        return (
+            f"User Input: {user_input}\n\n"
+            f"Enhanced Job Description: {orjson.dumps(enhanced_jd, option=orjson.OPT_SORT_KEYS).decode()}\n\n"
+            f"Sample Candidates: {orjson.dumps(generated_candidates, option=orjson.OPT_SORT_KEYS).decode()}\n\n"
+            f"Stored Candidates: {orjson.dumps(stored_candidates).decode()}"
+        )
+
+    def build_scoring_context(self, extracted_resume: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Creates the experience node for a parsed resume, looks up similar stored candidates and
+        returns the skill mapping together with the resume-specific matching candidate details.
+        """
+        candidate_name = extracted_resume.get("candidate_name", "Unknown")
+        experience_years = extracted_resume.get("work_experience", {}).get("years", 0)
+        experience_bucket = self.map_experience_to_bucket(experience_years)
+
+        self.neo4j_service.create_experience_node(experience_bucket)
+
+        primary_skills = extracted_resume.get("skills", {}).get("primary_skills", [])
+        secondary_skills = extracted_resume.get("skills", {}).get("secondary_skills", [])
+        combined_mapping = self.map_skills_to_conditional(primary_skills, secondary_skills)
+
+        similar_candidates_lines = []
+        # For each skill mapping entry, get detailed similar candidate info.
+        for mapping_entry in combined_mapping:
+            skill_name = mapping_entry['skill']
+            if mapping_entry['subskills']:
+                for subskill_entry in mapping_entry['subskills']:
+                    subskill_name = subskill_entry['subskill']
+                    # Use a new method that returns detailed matching candidate info.
+                    similar = self.neo4j_service.find_matching_candidates(experience_bucket, skill_name, subskill_name)
+                    similar_candidates_lines.append(f"Skill: {skill_name}, SubSkill: {subskill_name}, Matches: {similar}\n")
+            else:
+                similar = self.neo4j_service.find_candidates_for_same_experience_skill(experience_bucket, skill_name)
+                similar_candidates_lines.append(f"Skill: {skill_name}, Matches: {similar}\n")
+
+        return {
+            "candidate_name": candidate_name,
+            "experience_bucket": experience_bucket,
+            "combined_mapping": combined_mapping,
+            "similar_candidates_info": "".join(similar_candidates_lines)
+        }
+
+    def store_scored_resume(self, scoring_context: Dict[str, Any], resume_scoring: Dict[str, Any]) -> None:
+        """
+        Stores a scored candidate in Neo4j and links it to its skills.
+        """
+        candidate_name = scoring_context["candidate_name"]
+        experience_bucket = scoring_context["experience_bucket"]
+        overall_resume_score = resume_scoring.get("resume_score", 0)
+
+        self.neo4j_service.create_candidate(candidate_name, overall_resume_score)
+
+        # Conditional linking: if subskills exist for a mapping, link candidate to each subskill node;
+        # otherwise, link candidate directly to the Skill node.
+        for mapping_entry in scoring_context["combined_mapping"]:
+            skill_name = mapping_entry['skill']
+            self.neo4j_service.add_skill(experience_bucket, skill_name)
+            if mapping_entry['subskills']:
+                for subskill_entry in mapping_entry['subskills']:
+                    subskill_name = subskill_entry['subskill']
+                    self.neo4j_service.create_subskill_under_skill(experience_bucket, skill_name, subskill_name)
+                for subskill_entry in mapping_entry['subskills']:
+                    subskill_name = subskill_entry['subskill']
+                    self.neo4j_service.link_candidate_to_subskill(candidate_name, subskill_name)
+            else:
+                self.neo4j_service.link_candidate_to_skill(candidate_name, skill_name)
+
+    async def attach_similarities(
+        self,
+        extracted_resumes: List[Dict[str, Any]],
+        resume_scorings: List[Dict[str, Any]],
+        jd_embedding: np.ndarray
+    ) -> None:
+        """
+        Adds the cosine similarity against the enhanced job description to each scoring result.
+        """
+        similarities = await self.compute_similarities(extracted_resumes, jd_embedding)
+        for resume_scoring, similarity in zip(resume_scorings, similarities):
+            resume_scoring["cosine_similarity"] = float(similarity)
+
     async def parse_resume(self, file_buffer: BytesIO, filename: str) -> Dict[str, Any]:
         """
         Parses a resume file and extracts structured information.
@@ -165,63 +496,28 @@ class ResumeScoringService:
             file_buffer (BytesIO): The resume file buffer.
             filename (str): Name of the uploaded resume file.
 
+        Returns:
+            Dict containing structured resume data.
+        """
+        # File parsing is blocking CPU/IO work; keep it off the event loop.
+        text = await asyncio.to_thread(parse_pdf_or_docx, file_buffer, filename)
+        return await self.extract_resume(text)
+
+    async def extract_resume(self, text: str) -> Dict[str, Any]:
+        """
+        Extracts structured information from the plain text of a resume.
+
+        Args:
+            text (str): Text parsed from the resume file.
+
         Returns:
             Dict containing structured resume data.
         """
         try:
-            text = parse_pdf_or_docx(file_buffer, filename)
+            text = truncate_resume_text(text)
             today_date = datetime.now().strftime("%Y-%m-%d")
-            system_prompt = f"""
-            You are an AI model specializing in extracting structured information from resumes.
-            Parse the text and produce a JSON structure with these top-level fields, each of the following keys must be present:
-            1) candidate_name (string) — Full name, ensure spaces between first and last names if applicable.
-            2) email_address (string) - The email should be a valid email address with a "@" symbol and a domain name (gmail, outlook, etc..).
-            3) phone_number (string) - should be a valid phone number with country codes (default is +91 if none given) first, followed by a space and then the number.
-            4) work_experience (object containing 'years' (number) and 'months' (number)) - Ensure that overlapping work periods are handled correctly.
-            5) educations_duration (object containing 'years' (number) and 'months' (number)) — Calculate the correct total duration for education.
-            6) experiences (array of objects):
-                Each experience must include:
-                - title (string),
-                - company (string),
-                - description (string),
-                - date_start (string),
-                - date_end (string),
-                - skills (array of strings),
-                - tasks (array of strings)
-            7) educations (array of objects):
-                - institution (string),
-                - title (string),
-                - date_start (string),
-                - date_end (string),
-                - skills (string),
-                - tasks (string)
-            8) social_urls (array of objects, each with:
-                - type (string),
-                - url (string)
-            9) languages (array of objects, each with:
-                - name (string)
-            10) skills (object containing 'primary_skills' (array of strings) and 'secondary_skills' (array of strings))
-
-            11) certifications (array of objects, each with:
-                - name (string) any sort of online or offline certification or courses done by the candidate.
-
-            Key instructions for duration calculations:
-            - Calculate work_experience and educations_duration based on the start and end dates. Ensure that consecutive periods (without gaps) are treated as distinct and add up the durations without including the gap between roles.
-            - If "present," "ongoing," "current," or similar terms are mentioned, then use today's date {today_date} as the date_end and calculate the duration accordingly.
-            """
-            user_prompt = f"""
-            Extract structured information from this resume text:
-            {text}
-            Follow these instructions:
-            1. Parse the text and extract structured information according to the keys mentioned above.
-            2. Ensure that the total work experience is calculated accurately by accounting for overlaps and distinct periods.
-            3. Handle ongoing periods by comparing "present" with today's date and calculating the accurate duration.
-            4. For overlapping roles, calculate the total unique time worked without double-counting.
-            5. For education durations, calculate accurately.
-            6. Ensure no missing fields, and if any information is not provided, use null or empty arrays.
-            7. Return a valid JSON output with accurate dates and durations.
-            8. If no skills are explicitly or less than 10 are mentioned in the resume, generate a total of 10 relevant skills based on the candidate's experience and education.
-            """
+            system_prompt = _PARSE_SYS_TEMPLATE.format(today_date=today_date)
+            user_prompt = _PARSE_USER_TEMPLATE.format(text=text)
             structured_data = await self.gpt_service.extract_with_prompts(
                 system_prompt=system_prompt,
                 user_prompt=user_prompt,
@@ -237,81 +533,80 @@ class ResumeScoringService:
             logger.error(f"Error extracting resume details: {str(e)}", exc_info=True)
             raise
 
-    async def vectorize_resume(self, resume: Dict[str, Any]) -> List[float]:
+    async def parse_resume_limited(self, file_buffer: BytesIO, filename: str) -> Dict[str, Any]:
         """
-        Vectorizes the resume content for comparison with the job description.
+        Parses a resume while holding one of the service-wide extraction slots, which caps the
+        number of concurrent extraction requests sent to GPT.
         """
-        resume_text = (
-            f"{resume.get('candidate_name', '')} " +
-            f"{' '.join(resume.get('skills', {}).get('primary_skills', []))} " +
-            f"{' '.join([exp.get('description', '') for exp in resume.get('experiences', [])])}"
-        )
-        return await self.gpt_service.get_text_embedding(resume_text)
+        async with self.extraction_slots:
+            return await self.parse_resume(file_buffer, filename)
 
-    async def compute_similarity(self, resume: Dict[str, Any], enhanced_jd: Dict[str, Any]) -> float:
+    async def extract_resume_limited(self, text: str) -> Dict[str, Any]:
         """
-        Computes similarity between resume and enhanced job description using cosine similarity.
+        Extracts an already parsed resume while holding one of the service-wide extraction slots.
         """
-        resume_embedding = await self.vectorize_resume(resume)
-        jd_embedding = self.job_description_enhancer.temp_storage.get("vectorized_jd", [])
-        return cosine_similarity(np.array(jd_embedding), np.array(resume_embedding))
+        async with self.extraction_slots:
+            return await self.extract_resume(text)
 
-    async def score_resume(self, resume: Dict[str, Any], combined_criteria: str, generated_candidates: List[Dict[str, Any]]) -> Dict[str, Any]:
+    async def vectorize_resumes(self, resumes: List[Dict[str, Any]]) -> List[List[float]]:
         """
-        Scores an extracted resume against user input, enhanced JD, and sample candidates.
+        Vectorizes the content of several resumes for comparison with the job description,
+        using a single batched embeddings request.
+        """
+        return await self.gpt_service.get_text_embeddings([_resume_to_text(resume) for resume in resumes])
+
+    async def compute_similarities(self, resumes: List[Dict[str, Any]], jd_embedding: np.ndarray) -> np.ndarray:
+        """
+        Computes similarity between each resume and the enhanced job description using cosine similarity.
+        The JD embedding is precomputed by the enhancer, so only the resumes are embedded here.
+        Embeddings are unit-norm, so all cosines come from a single matrix-vector product and lie in [-1, 1];
+        a resume scores 0.0 when either embedding is missing.
+        """
+        if not resumes or not np.any(jd_embedding):
+            return np.zeros(len(resumes), dtype=np.float32)
+        resume_embeddings = []
+        for resume_embedding in await self.vectorize_resumes(resumes):
+            resume_embedding = np.asarray(resume_embedding, dtype=np.float16)
+            if resume_embedding.shape != jd_embedding.shape:
+                resume_embedding = np.zeros_like(jd_embedding)
+            resume_embeddings.append(resume_embedding)
+        # Embeddings are held as float16; accumulate in float32.
+        return np.stack(resume_embeddings).astype(np.float32) @ jd_embedding.astype(np.float32)
+
+    def build_scoring_prompts(self, resume: Dict[str, Any], shared_criteria: str, similar_candidates_info: str) -> Tuple[str, str]:
+        """
+        Builds the system and user prompts used to score a resume. The system prompt only holds
+        content shared by every resume of a run, so it forms a stable prefix for prompt caching.
 
         Args:
             resume (Dict[str, any]): Extracted resume details.
-            combined_criteria (str): The combined criteria for scoring.
-            candidates (List[Dict[str, any]]): List of sample candidates.
+            shared_criteria (str): User input, enhanced JD and sample candidates shared across resumes.
+            similar_candidates_info (str): Stored candidates matching this resume's skills.
 
         Returns:
-            Dict with resume score, analysis, and recommendations.
+            Tuple of (system_prompt, user_prompt).
         """
-        system_prompt = f"""
-        You are an AI tasked with evaluating resumes in relation to an user input (more priority), enhanced job description (second priority) and a set of sample candidates. The candidate's resume should be analyzed thoroughly, including both technical and non-technical aspects, and compared with the job description as well as the dummy candidates.
-
-        Your task is to perform a deep analysis of the candidate's resume and compare it to both the enhanced job description and the sample candidates. Every detail in the resume should be examined carefully, including skills, experiences, education, certifications, and any other relevant information. You need to assess the alignment of the candidate's profile with the job description and the sample candidates.
-
-        The analysis should include:
-        - Identification of any missing skills or experience gaps.
-        - A detailed summary of what the candidate possesses in terms of qualifications, expertise, and suitability for the role.
-        - A comparison of the candidate to the closest matching sample candidate from the generated set.
-        - Recommendations for improvement to help the candidate better match the job description.
+        system_prompt = _SCORING_SYS + shared_criteria
 
-        **Scoring Criteria:**
-        1. **Skill Match**: Assess both technical and soft skills mentioned in the resume.
-        2. **Experience Relevance**: Evaluate how well the candidate's past roles and industry experience align with the job description and sample candidates.
-        3. **Education & Certifications**: Check if the candidate's education and certifications match the requirements of the job description.
-        4. **Keyword Similarity**: Analyze the ATS (Applicant Tracking System) optimization by checking how well the resume matches keywords in the job description.
-
-        **Output Format:**
-        - **candidate_name**: Name of the candidate extracted from the resume.
-        - **resume_score**: A score assigned to the resume on a scale from 0 to 10 based on how well it aligns with the job description and sample candidates.
-        - **gap_analysis**: A list of missing skills or experience gaps identified in the candidate's resume.
-        - **candidate_summary**: A detailed summary of the candidate's qualifications, experience, and suitability for the job.
-        - **recommendations**: A set of recommendations for the candidate to improve their alignment with the job description.
+        user_prompt = _SCORING_USER_TEMPLATE.format(
+            resume_json=orjson.dumps(resume, option=orjson.OPT_SORT_KEYS).decode(),
+            similar_candidates_info=similar_candidates_info
+        )
+        return system_prompt, user_prompt
 
-        Your task is to analyze the candidate's resume carefully in relation to the enhanced job description and the sample candidates, and generate the report accordingly.
+    async def score_resume(self, resume: Dict[str, Any], shared_criteria: str, similar_candidates_info: str) -> Dict[str, Any]:
         """
+        Scores an extracted resume against user input, enhanced JD, and sample candidates.
 
-        user_prompt = f"""
-        Evaluate the following resume against the **Enhanced Job Description** and **Sample Candidates**.
-
-        You are an AI tasked with evaluating resumes in relation to an enhanced job description and a set of sample candidates. The candidate's resume should be analyzed thoroughly, including both technical and non-technical aspects, and compared with the job description as well as the dummy candidates.
-
-        Your task is to perform a deep analysis of the candidate's resume and compare it to both the enhanced job description and the sample candidates. Every detail in the resume should be examined carefully, including skills, experiences, education, certifications, and any other relevant information. You need to assess the alignment of the candidate's profile with the job description and the sample candidates.
-
-        The analysis should include:
-        - Identification of any missing skills or experience gaps.
-        - A detailed summary of what the candidate possesses in terms of qualifications, expertise, and suitability for the role.
-        - A comparison of the candidate to the closest matching sample candidate from the generated set.
-        - Recommendations for improvement to help the candidate better match the job description.
-
-        Resume details: {resume}
+        Args:
+            resume (Dict[str, any]): Extracted resume details.
+            shared_criteria (str): User input, enhanced JD and sample candidates shared across resumes.
+            similar_candidates_info (str): Stored candidates matching this resume's skills.
 
-        Enhanced Job Description + User Input + Matching Candidates: {combined_criteria}
+        Returns:
+            Dict with resume score, analysis, and recommendations.
         """
+        system_prompt, user_prompt = self.build_scoring_prompts(resume, shared_criteria, similar_candidates_info)
         try:
             scoring_result = await self.gpt_service.extract_with_prompts(
                 system_prompt=system_prompt,
@@ -327,27 +622,22 @@ class ResumeScoringService:
         if not experiences:
             print("No experiences provided")
             return {'years': 0, 'months': 0}
-        total_months = 0
-        parsed_experiences = [{'start': self.parse_date(exp['date_start']), 'end': self.parse_date(exp['date_end'])} for exp in experiences]
-        parsed_experiences.sort(key=lambda x: x['start'])
-        current_start = parsed_experiences[0]['start']
-        current_end = parsed_experiences[0]['end']
-        for i in range(1, len(parsed_experiences)):
-            start = parsed_experiences[i]['start']
-            end = parsed_experiences[i]['end']
-            if start <= current_end:
-                current_end = max(current_end, end)
-            else:
-                total_months += (current_end.year - current_start.year) * 12 + current_end.month - current_start.month
-                current_start = start
-                current_end = end
-        total_months += (current_end.year - current_start.year) * 12 + current_end.month - current_start.month
+        starts = np.fromiter((self.parse_date(exp['date_start']) for exp in experiences), dtype=np.int32, count=len(experiences))
+        ends = np.fromiter((self.parse_date(exp['date_end']) for exp in experiences), dtype=np.int32, count=len(experiences))
+        order = np.lexsort((ends, starts))
+        total_months = _merge_intervals(starts[order], ends[order])
         years = total_months // 12
         months = total_months % 12
         return {'years': years, 'months': months}
 
-    def parse_date(self, date_string: str) -> datetime:
+    def parse_date(self, date_string: str) -> int:
+        """
+        Converts a 'YYYY-MM-DD' date string into a month index (year * 12 + month).
+        Only the year and month are used for experience durations. Zero-padded dates are read by
+        slicing, other dates such as '2020-5-1' with strptime; if both fail, the current month is returned.
+        """
         try:
-            return datetime.strptime(date_string, '%Y-%m-%d')
-        except ValueError:
-            return datetime.now()
+            return _parse_month_index(date_string)
+        except (ValueError, TypeError, IndexError):
+            now = datetime.now()
+            return now.year * 12 + now.month
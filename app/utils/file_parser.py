@@ -1,18 +1,182 @@
 # app/utils/file_parser.py
 
 from io import BytesIO
-import logging
-from PyPDF2 import PdfReader
-from docx import Document
-import pytesseract
-from PIL import Image
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+import ctypes
+import numpy as np
 import re
 from zipfile import ZipFile
 import xml.etree.ElementTree as ET
-import win32com.client
 import tempfile
+import atexit
+import os
+import queue
+import shutil
+import subprocess
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dotenv import load_dotenv
+from pathlib import Path
+from typing import List, Optional, Tuple, TYPE_CHECKING
+from app.utils.logger import Logger, use_console_logging
 
-logger = logging.getLogger(__name__)
+# OCR and Word automation modules are imported where they are used: most uploads are PDF/DOCX,
+# and pywin32 only exists on Windows.
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = Logger(__name__).get_logger()
+
+# Settings below are read at import time, before any ConfigService is created.
+load_dotenv()
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif')
+# Tesseract can hang on very long image lists, so batched OCR runs are capped at this many images.
+OCR_BATCH_SIZE = 50
+# OCR engine: "tesseract" runs the Tesseract CLI through pytesseract, "tesserocr" keeps one
+# Tesseract API instance in process and "easyocr" runs EasyOCR (on the GPU when available).
+OCR_BACKEND = os.getenv("OCR_BACKEND", "tesseract").lower()
+
+_ocr_engine = None
+_ocr_engine_lock = threading.Lock()
+
+# Tesseract's OpenMP threads contend with each other when several images are OCR'd in parallel
+# (one CLI process per upload), so the CLI processes are kept single-threaded. pytesseract starts
+# them with this process's environment; the in-process backends keep their own threading.
+if OCR_BACKEND == "tesseract":
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+_pdfium_lock = threading.Lock()
+
+# WordprocessingML elements read when extracting DOCX text.
+W_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_PARAGRAPH = W_NAMESPACE + "p"
+W_RUN = W_NAMESPACE + "r"
+W_TEXT = W_NAMESPACE + "t"
+W_TAB = W_NAMESPACE + "tab"
+W_BREAK = W_NAMESPACE + "br"
+W_CARRIAGE_RETURN = W_NAMESPACE + "cr"
+W_TYPE = W_NAMESPACE + "type"
+# Markup-compatibility fallback, an older duplicate of the alternate content (e.g. text boxes).
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+DOCX_HEADER_PATTERN = re.compile(r"^word/header\d*\.xml$")
+DOCX_FOOTER_PATTERN = re.compile(r"^word/footer\d*\.xml$")
+# Relationship parts of the DOCX body, headers and footers, where hyperlink targets are stored.
+DOCX_RELS_PATTERN = re.compile(r"^word/_rels/(document|header\d*|footer\d*)\.xml\.rels$")
+
+# DOC files are converted with headless LibreOffice when it is installed, otherwise through Word over COM.
+SOFFICE_PATH = shutil.which("soffice") or shutil.which("libreoffice")
+SOFFICE_TIMEOUT = 120
+# Number of concurrent soffice conversions. Each slot keeps its own LibreOffice profile, since
+# concurrent soffice processes cannot share one and a fresh profile is slow to initialize.
+DOC_CONVERTER_WORKERS = int(os.getenv("DOC_CONVERTER_WORKERS", "2"))
+
+# Parsed text is cached per file content (SHA-256) and extension, in Redis when REDIS_URL is set
+# and in a bounded in-process LRU otherwise.
+DOC_CACHE_SIZE = 512
+DOC_CACHE_TTL = int(os.getenv("DOC_CACHE_TTL", "86400"))
+# Seconds to wait for Redis before treating a cache lookup or write as failed.
+REDIS_TIMEOUT = 1.0
+
+_doc_cache: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+_doc_cache_lock = threading.Lock()
+_redis_client = None
+
+# Number of worker processes parse_many uses for PDF and DOCX files.
+PARSE_PROCESSES = int(os.getenv("PARSE_PROCESSES", str(os.cpu_count() or 1)))
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+# Without soffice, Word is driven over COM from one dedicated thread: COM objects belong to the
+# thread that created them, and the single worker serializes access to the one Word instance,
+# which is started once instead of for every file.
+_word_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="word")
+_word = None
+
+# Scratch directory for DOC conversions and soffice profiles, created once and removed at exit.
+DOC_TMPDIR = tempfile.mkdtemp(prefix="doc_parser_")
+atexit.register(shutil.rmtree, DOC_TMPDIR, ignore_errors=True)
+
+_soffice_profiles = queue.Queue()
+for _slot in range(DOC_CONVERTER_WORKERS):
+    _soffice_profiles.put(os.path.join(DOC_TMPDIR, f"soffice_profile_{_slot}"))
+
+def _get_redis_client():
+    """
+    Returns the Redis client used as the parsed-text cache, or None when REDIS_URL is not set.
+    """
+    global _redis_client
+    if _redis_client is None and os.getenv("REDIS_URL"):
+        import redis
+        # Short timeouts, so a slow Redis turns into a cache miss rather than a slow upload.
+        _redis_client = redis.Redis.from_url(
+            os.getenv("REDIS_URL"),
+            socket_connect_timeout=REDIS_TIMEOUT,
+            socket_timeout=REDIS_TIMEOUT
+        )
+    return _redis_client
+
+def _document_cache_key(file_buffer: BytesIO, extension: str) -> str:
+    """
+    Builds the parsed-text cache key of an uploaded file from its content and lower-cased extension.
+    """
+    content_hash = hashlib.sha256(file_buffer.getvalue()).hexdigest()
+    file_buffer.seek(0)
+    return f"parsed_text:{content_hash}{extension}"
+
+def _get_cached_text(cache_key: str) -> Optional[str]:
+    """
+    Returns the cached parsed text for a key, or None on a miss or an expired entry.
+    Redis being down or slow counts as a miss, since the cache is only an optimization.
+    """
+    redis_client = _get_redis_client()
+    if redis_client is not None:
+        try:
+            cached = redis_client.get(cache_key)
+        except Exception as e:
+            logger.warning(f"Parsed-text cache read failed, parsing the file: {str(e)}")
+            return None
+        return cached.decode("utf-8") if cached is not None else None
+
+    with _doc_cache_lock:
+        entry = _doc_cache.get(cache_key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if expires_at < time.monotonic():
+            del _doc_cache[cache_key]
+            return None
+        _doc_cache.move_to_end(cache_key)
+        return text
+
+def _cache_text(cache_key: str, text: str) -> None:
+    """
+    Stores parsed text under a key for DOC_CACHE_TTL seconds. Empty text is not cached, so a
+    parse that silently produced nothing is retried on the next upload. Redis errors skip the write.
+    """
+    if not text:
+        return
+    redis_client = _get_redis_client()
+    if redis_client is not None:
+        try:
+            redis_client.set(cache_key, text, ex=DOC_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Parsed-text cache write failed: {str(e)}")
+        return
+
+    with _doc_cache_lock:
+        _doc_cache[cache_key] = (time.monotonic() + DOC_CACHE_TTL, text)
+        _doc_cache.move_to_end(cache_key)
+        while len(_doc_cache) > DOC_CACHE_SIZE:
+            _doc_cache.popitem(last=False)
 
 def parse_pdf_or_docx(file_buffer: BytesIO, filename: str) -> str:
     """
@@ -22,20 +186,142 @@ def parse_pdf_or_docx(file_buffer: BytesIO, filename: str) -> str:
     :return: Extracted text content as a string.
     """
     try:
-        if filename.lower().endswith(".pdf"):
-            return parse_pdf(file_buffer)
-        elif filename.lower().endswith(".docx"):
-            return parse_docx(file_buffer)
-        elif filename.lower().endswith(".doc"):
-            return parse_doc(file_buffer)
-        elif filename.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
-            return image_to_text(file_buffer)  # Handle image to text conversion
-        else:
+        extension = os.path.splitext(filename)[1].lower()
+        parser = PARSERS_BY_EXTENSION.get(extension)
+        if parser is None:
             raise ValueError("Unsupported file format. Only PDF, DOCX, DOC, and image formats are supported.")
+
+        # Identical uploads (e.g. the same resume scored again) are served from the cache.
+        cache_key = _document_cache_key(file_buffer, extension)
+        text = _get_cached_text(cache_key)
+        if text is not None:
+            return text
+
+        text = parser(file_buffer)
+        _cache_text(cache_key, text)
+        return text
     except Exception as e:
         logger.error(f"Error parsing file '{filename}': {str(e)}", exc_info=True)
         raise
 
+def parse_many(files: List[Tuple[BytesIO, str]]) -> List[str]:
+    """
+    Extracts text from several uploaded files at once. PDF and DOCX files are parsed in a pool of
+    worker processes, DOC files in threads (they wait on soffice or Word; with soffice, one
+    conversion run per slot), and images are OCR'd together in batched Tesseract runs.
+    Cached files are not parsed again.
+    :param files: (file buffer, file name) pairs of the uploaded files.
+    :return: Extracted text content of each file, in input order.
+    """
+    try:
+        texts = [""] * len(files)
+        pending = []
+        image_jobs = []
+        soffice_jobs = []
+        with ThreadPoolExecutor(max_workers=DOC_CONVERTER_WORKERS) as doc_executor:
+            for index, (file_buffer, filename) in enumerate(files):
+                extension = os.path.splitext(filename)[1].lower()
+                parser = PARSERS_BY_EXTENSION.get(extension)
+                if parser is None:
+                    raise ValueError(f"Unsupported file format for '{filename}'. Only PDF, DOCX, DOC, and image formats are supported.")
+
+                cache_key = _document_cache_key(file_buffer, extension)
+                cached = _get_cached_text(cache_key)
+                if cached is not None:
+                    texts[index] = cached
+                elif extension in IMAGE_EXTENSIONS:
+                    image_jobs.append((index, cache_key, file_buffer))
+                elif extension == ".doc" and SOFFICE_PATH:
+                    soffice_jobs.append((index, cache_key, file_buffer))
+                elif extension == ".doc":
+                    pending.append((index, cache_key, file_buffer, parser, None, doc_executor.submit(parser, file_buffer)))
+                else:
+                    pending.append((index, cache_key, file_buffer, parser, *_submit_to_process_pool(parser, file_buffer)))
+
+            # DOC files are split across the soffice slots, one LibreOffice run per slot.
+            soffice_batches = [soffice_jobs[slot::DOC_CONVERTER_WORKERS] for slot in range(DOC_CONVERTER_WORKERS)]
+            soffice_futures = [
+                (batch, doc_executor.submit(convert_docs_with_soffice, [file_buffer.getvalue() for _, _, file_buffer in batch]))
+                for batch in soffice_batches if batch
+            ]
+
+            # OCR runs in this thread while the pools work through the other files
+            if image_jobs:
+                image_texts = image_to_text_batch([file_buffer for _, _, file_buffer in image_jobs])
+                for (index, cache_key, _), text in zip(image_jobs, image_texts):
+                    texts[index] = text
+                    _cache_text(cache_key, text)
+
+            for batch, future in soffice_futures:
+                for (index, cache_key, _), text in zip(batch, future.result()):
+                    texts[index] = text.strip()
+                    _cache_text(cache_key, texts[index])
+
+            broken = []
+            for index, cache_key, file_buffer, parser, process_pool, future in pending:
+                try:
+                    texts[index] = future.result()
+                except BrokenProcessPool:
+                    _discard_process_pool(process_pool)
+                    broken.append((index, cache_key, file_buffer, parser))
+                    continue
+                _cache_text(cache_key, texts[index])
+
+            # A worker died (e.g. PDFium crashed on a malformed file), which breaks its whole pool:
+            # the files it had not parsed are retried once on a new pool.
+            retries = [
+                (index, cache_key, _submit_to_process_pool(parser, file_buffer)[1])
+                for index, cache_key, file_buffer, parser in broken
+            ]
+            for index, cache_key, future in retries:
+                texts[index] = future.result()
+                _cache_text(cache_key, texts[index])
+        return texts
+
+    except Exception as e:
+        logger.error(f"Error parsing files: {str(e)}", exc_info=True)
+        raise
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """
+    Returns the process pool that parses PDF and DOCX files, creating it on first use.
+    Workers are spawned rather than forked, since PDFium and the log listener thread do not
+    survive a fork, and log to the console only.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(
+                max_workers=PARSE_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=use_console_logging
+            )
+        return _process_pool
+
+def _submit_to_process_pool(parser, file_buffer: BytesIO) -> Tuple[ProcessPoolExecutor, Future]:
+    """
+    Submits a file to the process pool, replacing the pool first if a dead worker has broken it.
+    :return: The pool the file was submitted to and the future of its text.
+    """
+    process_pool = _get_process_pool()
+    try:
+        return process_pool, process_pool.submit(parser, file_buffer)
+    except BrokenProcessPool:
+        _discard_process_pool(process_pool)
+        process_pool = _get_process_pool()
+        return process_pool, process_pool.submit(parser, file_buffer)
+
+def _discard_process_pool(process_pool: ProcessPoolExecutor) -> None:
+    """
+    Drops a broken process pool, so the next submit starts a new one. A pool that was already
+    replaced (e.g. by a concurrent parse_many call) is left as it is.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is process_pool:
+            _process_pool = None
+    process_pool.shutdown(wait=False)
+
 def parse_pdf(file_buffer: BytesIO) -> str:
     """
     Extracts text from a PDF file, including hyperlinks.
@@ -44,23 +330,23 @@ def parse_pdf(file_buffer: BytesIO) -> str:
     """
     try:
         logger.info("Parsing PDF file")
-        reader = PdfReader(file_buffer)
-        text = ""
+        page_texts = []
         hyperlinks = []
 
-        # Extract text from each page and gather hyperlinks from metadata if available
-        for page in reader.pages:
-            page_text = page.extract_text() or ""
-            text += page_text
+        # PDFium is not thread-safe, even across documents, so all PDFium calls are serialized
+        with _pdfium_lock:
+            pdf = pdfium.PdfDocument(file_buffer.getvalue())
+            try:
+                for page in pdf:
+                    text_page = page.get_textpage()
+                    page_texts.append(text_page.get_text_range().replace("\r\n", "\n"))
+                    text_page.close()
+                    hyperlinks.extend(_extract_annot_uris(pdf, page))
+                    page.close()
+            finally:
+                pdf.close()
 
-            # Extract hyperlinks from annotations (if available)
-            if "/Annots" in page:
-                annotations = page["/Annots"]
-                for annotation in annotations:
-                    # Check if annotation is an IndirectObject and resolve it properly
-                    if isinstance(annotation, dict):
-                        if "/A" in annotation and "/URI" in annotation["/A"]:
-                            hyperlinks.append(annotation["/A"]["/URI"])
+        text = "\n".join(page_texts)
 
         # Join the hyperlinks into a single string (one per line)
         hyperlinks_text = '\n'.join(hyperlinks)
@@ -70,26 +356,42 @@ def parse_pdf(file_buffer: BytesIO) -> str:
         logger.error(f"Error reading PDF file: {str(e)}", exc_info=True)
         raise
 
+def _extract_annot_uris(pdf, page) -> List[str]:
+    """
+    Returns the URIs of the link annotations of a PDF page.
+    """
+    uris = []
+    position = ctypes.c_int(0)
+    link = pdfium_c.FPDF_LINK()
+    while pdfium_c.FPDFLink_Enumerate(page, ctypes.byref(position), ctypes.byref(link)):
+        action = pdfium_c.FPDFLink_GetAction(link)
+        if not action or pdfium_c.FPDFAction_GetType(action) != pdfium_c.PDFACTION_URI:
+            continue
+        # First call returns the buffer size, second one fills it (NUL-terminated 7-bit ASCII)
+        length = pdfium_c.FPDFAction_GetURIPath(pdf, action, None, 0)
+        buffer = ctypes.create_string_buffer(length)
+        pdfium_c.FPDFAction_GetURIPath(pdf, action, buffer, length)
+        uris.append(buffer.value.decode("utf-8", errors="replace"))
+    return uris
+
 def parse_docx(file_buffer: BytesIO) -> str:
     """
-    Extracts text from a DOCX file, including hyperlinks and headers/footers.
+    Extracts text from a DOCX file, including hyperlinks and headers/footers. The package is opened
+    once and every XML part is streamed a single time.
     :param file_buffer: File buffer of the uploaded DOCX file.
     :return: Extracted text content as a string, including hyperlinks.
     """
     try:
         logger.info("Parsing DOCX file")
-        doc = Document(file_buffer)
-        text = ""
+        with ZipFile(file_buffer) as docx:
+            # Extract text from the paragraphs of the document body (tables included)
+            text = extract_docx_part_text(docx, "word/document.xml")
 
-        # Extract text from paragraphs
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + '\n'
+            # Extract hyperlinks from the relationship parts of the document
+            hyperlinks = extract_hyperlinks_from_docx(docx)
 
-        # Extract hyperlinks from the document (href="...") in the HTML of the document
-        hyperlinks = extract_hyperlinks_from_docx(file_buffer)
-        
-        # Extract header and footer text
-        header_footer_text = extract_header_footer(doc)
+            # Extract header and footer text
+            header_footer_text = extract_header_footer(docx)
 
         return text.strip() + '\n' + hyperlinks + '\n' + header_footer_text
 
@@ -97,46 +399,86 @@ def parse_docx(file_buffer: BytesIO) -> str:
         logger.error(f"Error reading DOCX file: {str(e)}", exc_info=True)
         raise
 
-def extract_hyperlinks_from_docx(file_buffer: BytesIO) -> str:
+def extract_docx_part_text(docx: ZipFile, name: str) -> str:
+    """
+    Streams one WordprocessingML part and returns its text, one line per paragraph. Paragraphs
+    nested in a paragraph (text boxes) get their own lines after it, and the mc:Fallback copy
+    of alternate content is skipped so text boxes are not read twice.
+    :param docx: The DOCX file opened as a zip.
+    :param name: Name of the XML part inside the package.
+    :return: Text of the part.
     """
-    Extracts hyperlinks from a DOCX file by scanning for <a> tags in the document's HTML.
-    :param file_buffer: The file buffer of the DOCX file.
+    paragraphs = []
+    # [slot in paragraphs, collected runs, run nesting depth] of every paragraph currently open
+    open_paragraphs = []
+    fallback_depth = 0
+    with docx.open(name) as part:
+        for event, elem in ET.iterparse(part, events=("start", "end")):
+            if elem.tag == MC_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+                continue
+            if fallback_depth:
+                continue
+
+            if elem.tag == W_PARAGRAPH:
+                if event == "start":
+                    # Reserve the slot now so an outer paragraph comes before the ones nested in it
+                    open_paragraphs.append([len(paragraphs), [], 0])
+                    paragraphs.append("")
+                else:
+                    slot, runs, _ = open_paragraphs.pop()
+                    paragraphs[slot] = "".join(runs)
+                    elem.clear()
+                continue
+            if not open_paragraphs:
+                continue
+
+            paragraph = open_paragraphs[-1]
+            if elem.tag == W_RUN:
+                paragraph[2] += 1 if event == "start" else -1
+            elif event == "end" and paragraph[2]:
+                # Only run content counts; w:tab also appears as a tab stop in paragraph properties
+                if elem.tag == W_TEXT:
+                    paragraph[1].append(elem.text or "")
+                elif elem.tag == W_TAB:
+                    paragraph[1].append("\t")
+                elif elem.tag == W_CARRIAGE_RETURN or (elem.tag == W_BREAK and elem.get(W_TYPE) != "page"):
+                    paragraph[1].append("\n")
+    return "\n".join(paragraphs)
+
+def extract_hyperlinks_from_docx(docx: ZipFile) -> str:
+    """
+    Extracts hyperlinks from a DOCX file. Link targets are stored as hyperlink relationships in the
+    relationship parts of the document body, headers and footers, which are streamed with iterparse.
+    :param docx: The DOCX file opened as a zip.
     :return: A string containing all hyperlinks found in the document.
     """
     try:
-        # Load the DOCX file as a zip and read the XML content
-        docx = ZipFile(file_buffer)
         hyperlinks = []
-        for file in docx.namelist():
-            if "hyperlink" in file:
-                content = docx.read(file)
-                links = re.findall(r'href="([^"]+)"', content.decode('utf-8'))
-                hyperlinks.extend(links)
+        for name in docx.namelist():
+            if not DOCX_RELS_PATTERN.match(name):
+                continue
+            with docx.open(name) as rels:
+                for _, elem in ET.iterparse(rels, events=("end",)):
+                    if elem.tag.endswith("Relationship") and elem.get("Type", "").endswith("/hyperlink"):
+                        hyperlinks.append(elem.get("Target"))
+                    elem.clear()
         return '\n'.join(hyperlinks)
 
     except Exception as e:
         logger.error(f"Error extracting hyperlinks from DOCX file: {str(e)}", exc_info=True)
         raise
 
-def extract_header_footer(doc) -> str:
+def extract_header_footer(docx: ZipFile) -> str:
     """
     Extract text from headers and footers in a DOCX file.
-    :param doc: The Document object for DOCX file.
+    :param docx: The DOCX file opened as a zip.
     :return: Text from the headers and footers.
     """
-    text = ""
-    # Extract text from headers
-    for section in doc.sections:
-        header = section.header
-        for paragraph in header.paragraphs:
-            text += paragraph.text + '\n'
-        
-        # Extract text from footers
-        footer = section.footer
-        for paragraph in footer.paragraphs:
-            text += paragraph.text + '\n'
-
-    return text.strip()
+    names = docx.namelist()
+    headers = sorted(name for name in names if DOCX_HEADER_PATTERN.match(name))
+    footers = sorted(name for name in names if DOCX_FOOTER_PATTERN.match(name))
+    return '\n'.join(extract_docx_part_text(docx, name) for name in headers + footers).strip()
 
 def parse_doc(file_buffer: BytesIO) -> str:
     """
@@ -146,21 +488,18 @@ def parse_doc(file_buffer: BytesIO) -> str:
     """
     try:
         logger.info("Parsing DOC file")
-        # Create a temporary file to save the DOC file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".doc") as temp_file:
-            temp_file.write(file_buffer.read())
-            temp_filename = temp_file.name
-        
-        # Initialize COM client for Word
-        word = win32com.client.Dispatch("Word.Application")
-        doc = word.Documents.Open(temp_filename)
-
-        # Extract text from the DOC file
-        doc_text = doc.Content.Text
-        
-        # Close Word document
-        doc.Close()
-        word.Quit()
+        if SOFFICE_PATH:
+            return convert_doc_with_soffice(file_buffer.read()).strip()
+
+        # Save the DOC file to this thread's scratch file
+        doc_path = doc_scratch_path(".doc")
+        with open(doc_path, "wb") as doc_file:
+            doc_file.write(file_buffer.read())
+
+        try:
+            doc_text = _word_executor.submit(read_doc_with_word, doc_path).result()
+        finally:
+            release_scratch_file(doc_path)
 
         return doc_text.strip()
     
@@ -168,18 +507,267 @@ def parse_doc(file_buffer: BytesIO) -> str:
         logger.error(f"Error reading DOC file: {str(e)}", exc_info=True)
         raise
 
+def read_doc_with_word(doc_path: str) -> str:
+    """
+    Reads the text of a DOC file with the shared Word instance, starting Word on first use.
+    If Word has crashed or hung, the instance is discarded and the read retried once with a new one.
+    Runs on the Word thread only.
+    :param doc_path: Path of the DOC file.
+    :return: Text content of the document.
+    """
+    from pywintypes import com_error
+
+    try:
+        return _read_with_word(doc_path)
+    except com_error as e:
+        logger.warning(f"Word failed to read the DOC file, restarting it: {str(e)}")
+        _quit_word()
+        return _read_with_word(doc_path)
+
+def _read_with_word(doc_path: str) -> str:
+    """
+    Opens a DOC file read-only in the shared Word instance and returns its text.
+    """
+    global _word
+    if _word is None:
+        import pythoncom
+        import win32com.client
+        pythoncom.CoInitialize()
+        _word = win32com.client.DispatchEx("Word.Application")
+        _word.Visible = False
+        _word.DisplayAlerts = 0
+
+    doc = _word.Documents.Open(doc_path, ReadOnly=True)
+    try:
+        return doc.Content.Text
+    finally:
+        doc.Close(SaveChanges=0)
+
+def _quit_word() -> None:
+    """
+    Quits the shared Word instance, if it was started. Runs on the Word thread only.
+    The instance is dropped even if Word no longer answers, so the next read starts a new one.
+    """
+    global _word
+    if _word is not None:
+        from pywintypes import com_error
+
+        try:
+            _word.Quit()
+        except com_error as e:
+            logger.warning(f"Could not quit Word: {str(e)}")
+        finally:
+            _word = None
+
+def close_doc_converters() -> None:
+    """
+    Quits the shared Word instance, stops the Word thread and shuts down the parser worker processes.
+    Call once on application shutdown.
+    """
+    global _process_pool
+    _word_executor.submit(_quit_word).result()
+    _word_executor.shutdown()
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown()
+            _process_pool = None
+
+def convert_doc_with_soffice(doc_bytes: bytes) -> str:
+    """
+    Converts a DOC file to plain text with headless LibreOffice, using one of the pooled profiles.
+    :param doc_bytes: Content of the DOC file.
+    :return: Text content of the document.
+    """
+    return convert_docs_with_soffice([doc_bytes])[0]
+
+def convert_docs_with_soffice(docs: List[bytes]) -> List[str]:
+    """
+    Converts several DOC files to plain text with a single headless LibreOffice run, using one of
+    the pooled profiles, so soffice starts once per batch rather than once per file.
+    :param docs: Content of each DOC file.
+    :return: Text content of each document, in input order.
+    """
+    profile_dir = _soffice_profiles.get()
+    # Each run gets its own directory, so a conversion can never read the output of another one.
+    run_dir = tempfile.mkdtemp(dir=DOC_TMPDIR)
+    try:
+        doc_paths = []
+        for index, doc_bytes in enumerate(docs):
+            doc_path = os.path.join(run_dir, f"doc_{index}.doc")
+            with open(doc_path, "wb") as doc_file:
+                doc_file.write(doc_bytes)
+            doc_paths.append(doc_path)
+
+        subprocess.run(
+            [
+                SOFFICE_PATH,
+                f"-env:UserInstallation={Path(profile_dir).as_uri()}",
+                "--headless",
+                "--convert-to", "txt:Text (encoded):UTF8",
+                "--outdir", run_dir,
+                *doc_paths
+            ],
+            check=True,
+            capture_output=True,
+            timeout=SOFFICE_TIMEOUT * len(docs)
+        )
+
+        texts = []
+        for doc_path in doc_paths:
+            text_path = os.path.splitext(doc_path)[0] + ".txt"
+            # soffice can exit 0 without writing anything for a corrupt or unsupported file
+            if not os.path.exists(text_path):
+                raise ValueError("LibreOffice did not produce any text output for the DOC file")
+            with open(text_path, encoding="utf-8-sig") as text_file:
+                texts.append(text_file.read())
+        return texts
+    finally:
+        shutil.rmtree(run_dir, ignore_errors=True)
+        _soffice_profiles.put(profile_dir)
+
+def doc_scratch_path(suffix: str) -> str:
+    """
+    Returns the calling thread's scratch file in DOC_TMPDIR. Each thread converts one document at
+    a time, so the same path is reused for every conversion instead of creating new temp files.
+    :param suffix: File extension of the scratch file.
+    :return: Path of the scratch file.
+    """
+    return os.path.join(DOC_TMPDIR, f"{threading.get_ident()}{suffix}")
+
+def release_scratch_file(path: str) -> None:
+    """
+    Empties a scratch file after use so the document does not stay on disk; the entry itself is kept for reuse.
+    :param path: Path of the scratch file.
+    """
+    if os.path.exists(path):
+        os.truncate(path, 0)
+
+def load_ocr_image(file_buffer: BytesIO) -> "Image.Image":
+    """
+    Decode an image once and convert it to 8-bit grayscale. Tesseract binarizes its input anyway,
+    and the grayscale PNG handed to it is about a third of the size of an RGB one.
+    :param file_buffer: The image file buffer.
+    :return: The grayscale image.
+    """
+    from PIL import Image
+
+    image = Image.open(file_buffer)
+    image.load()
+    return image if image.mode == "L" else image.convert("L")
+
 def image_to_text(file_buffer: BytesIO) -> str:
     """
-    Extract text from an image using Tesseract OCR.
+    Extract text from an image using the configured OCR backend (Tesseract by default).
     :param file_buffer: The image file buffer.
     :return: Extracted text content as a string.
     """
     try:
         logger.info("Extracting text from image")
-        image = Image.open(file_buffer)
-        text = pytesseract.image_to_string(image)
+        image = load_ocr_image(file_buffer)
+        if OCR_BACKEND == "tesseract":
+            import pytesseract
+            text = pytesseract.image_to_string(image)
+        else:
+            text = ocr_images_in_process([image])[0]
         return text.strip()
     
     except Exception as e:
         logger.error(f"Error processing image file: {str(e)}", exc_info=True)
         raise
+
+def image_to_text_batch(file_buffers: List[BytesIO]) -> List[str]:
+    """
+    Extract text from several images, running one Tesseract process per batch of images
+    instead of one per image (or one in-process call per batch for the other OCR backends).
+    :param file_buffers: The image file buffers.
+    :return: Extracted text content of each image, in input order.
+    """
+    try:
+        logger.info(f"Extracting text from {len(file_buffers)} images")
+        texts = []
+        for batch_start in range(0, len(file_buffers), OCR_BATCH_SIZE):
+            batch = file_buffers[batch_start:batch_start + OCR_BATCH_SIZE]
+            if OCR_BACKEND != "tesseract":
+                texts.extend(text.strip() for text in ocr_images_in_process([load_ocr_image(file_buffer) for file_buffer in batch]))
+                continue
+
+            with tempfile.TemporaryDirectory() as temp_dir:
+                # Tesseract reads a text file input as a list of image paths, one per line.
+                image_paths = []
+                for index, file_buffer in enumerate(batch):
+                    image = load_ocr_image(file_buffer)
+                    image_path = os.path.join(temp_dir, f"image_{index}.png")
+                    image.save(image_path)
+                    image_paths.append(image_path)
+
+                image_list_path = os.path.join(temp_dir, "images.txt")
+                with open(image_list_path, "w") as image_list:
+                    image_list.write("\n".join(image_paths) + "\n")
+
+                # Tesseract ends every page with a form feed.
+                import pytesseract
+                pages = pytesseract.image_to_string(image_list_path).split("\x0c")
+
+            if len(pages) < len(batch):
+                raise ValueError(f"Expected {len(batch)} OCR pages, got {len(pages)}")
+            texts.extend(page.strip() for page in pages[:len(batch)])
+        return texts
+
+    except Exception as e:
+        logger.error(f"Error processing image files: {str(e)}", exc_info=True)
+        raise
+
+def ocr_images_in_process(images: List["Image.Image"]) -> List[str]:
+    """
+    Run OCR on grayscale images with the in-process backend (tesserocr or EasyOCR). The engine is
+    loaded once and is not thread-safe, so calls are serialized.
+    :param images: Grayscale images from load_ocr_image.
+    :return: Text of each image, in input order.
+    """
+    with _ocr_engine_lock:
+        engine = _get_ocr_engine()
+        if OCR_BACKEND == "tesserocr":
+            texts = []
+            for image in images:
+                engine.SetImage(image)
+                texts.append(engine.GetUTF8Text())
+            return texts
+
+        # readtext_batched stacks the batch into one tensor, so every image is resized to a common size
+        n_width = max(image.width for image in images)
+        n_height = max(image.height for image in images)
+        results = engine.readtext_batched(
+            [np.asarray(image) for image in images],
+            n_width=n_width,
+            n_height=n_height,
+            detail=0,
+            paragraph=True
+        )
+        return ['\n'.join(lines) for lines in results]
+
+def _get_ocr_engine():
+    """
+    Returns the in-process OCR engine for OCR_BACKEND, loading (and for EasyOCR, warming) it on first use.
+    Must be called with _ocr_engine_lock held.
+    """
+    global _ocr_engine
+    if _ocr_engine is None:
+        if OCR_BACKEND == "tesserocr":
+            import tesserocr
+            _ocr_engine = tesserocr.PyTessBaseAPI(lang="eng")
+        elif OCR_BACKEND == "easyocr":
+            import easyocr
+            _ocr_engine = easyocr.Reader(["en"], gpu=True, cudnn_benchmark=True)
+            # The first inference pays for model and kernel setup; run it on a blank image now
+            _ocr_engine.readtext(np.zeros((64, 64), dtype=np.uint8))
+        else:
+            raise ValueError(f"Unsupported OCR_BACKEND '{OCR_BACKEND}'. Use tesseract, tesserocr or easyocr.")
+    return _ocr_engine
+
+# Parser for each supported (lower-cased) file extension, used by parse_pdf_or_docx.
+PARSERS_BY_EXTENSION = {
+    ".pdf": parse_pdf,
+    ".docx": parse_docx,
+    ".doc": parse_doc,
+    **{extension: image_to_text for extension in IMAGE_EXTENSIONS},
+}
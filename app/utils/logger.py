@@ -1,6 +1,53 @@
+import atexit
 import logging
+import queue
 import sys
-from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+# Define log format with timestamp
+formatter = logging.Formatter(
+    "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S"
+)
+
+# Handlers are created once and shared by every logger, so constructing Logger(name)
+# several times for the same name never stacks duplicate handlers.
+
+# Console handler
+console_handler = logging.StreamHandler(sys.stdout)
+console_handler.setFormatter(formatter)
+
+# File handler, rolled over to logs.log.YYYY-MM-DD at midnight. The file is opened on the first record,
+# so worker processes that switch to use_console_logging never open it.
+file_handler = TimedRotatingFileHandler("logs.log", when="midnight", delay=True)
+file_handler.setFormatter(formatter)
+
+# Loggers only enqueue records; a background thread formats them and writes them to the
+# console and the file, so logging from request handlers and parser threads never blocks on I/O.
+log_queue = queue.Queue(-1)
+queue_handler = QueueHandler(log_queue)
+queue_listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+queue_listener.start()
+# Drain the queue before the interpreter exits
+atexit.register(queue_listener.stop)
+
+# Handler attached to new loggers; use_console_logging switches it to the console handler.
+log_handler = queue_handler
+
+def use_console_logging() -> None:
+    """
+    Makes every logger of this process write straight to the console, and stops the log listener.
+    Initializer of the file parser's worker processes: only the API process writes logs.log, since
+    several processes rotating the same file at midnight would clobber it.
+    """
+    global log_handler
+    log_handler = console_handler
+    for logger in logging.Logger.manager.loggerDict.values():
+        if isinstance(logger, logging.Logger) and queue_handler in logger.handlers:
+            logger.removeHandler(queue_handler)
+            logger.addHandler(console_handler)
+    queue_listener.stop()
+    atexit.unregister(queue_listener.stop)
 
 class Logger:
     """
@@ -12,26 +59,11 @@ class Logger:
         :param name: Name of the logger (typically the module name).
         """
         self.logger = logging.getLogger(name)
+        if self.logger.handlers:
+            return
         self.logger.setLevel(logging.INFO)
 
-        # Define log format with timestamp
-        formatter = logging.Formatter(
-            "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        )
-
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(formatter)
-
-        # File handler
-        log_filename = f"logs_{datetime.now().strftime('%Y-%m-%d')}.log"
-        file_handler = logging.FileHandler(log_filename)
-        file_handler.setFormatter(formatter)
-
-        # Add handlers
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
+        self.logger.addHandler(log_handler)
 
     def get_logger(self):
         """
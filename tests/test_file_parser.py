@@ -0,0 +1,104 @@
+import os
+from functools import partial
+from io import BytesIO
+from zipfile import ZipFile
+
+from app.utils import file_parser
+from app.utils.file_parser import parse_docx, parse_many, parse_pdf_or_docx
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+R = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+
+
+def build_docx(body: str, header: str = "", rels: str = "") -> BytesIO:
+    """
+    Builds a minimal DOCX package with the given document body, optional header and body relationships.
+    """
+    buffer = BytesIO()
+    with ZipFile(buffer, "w") as docx:
+        docx.writestr("word/document.xml", f"<w:document {W} {MC} {R}><w:body>{body}</w:body></w:document>")
+        if header:
+            docx.writestr("word/header1.xml", f"<w:hdr {W}>{header}</w:hdr>")
+        if rels:
+            docx.writestr(
+                "word/_rels/document.xml.rels",
+                f'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">{rels}</Relationships>'
+            )
+    buffer.seek(0)
+    return buffer
+
+
+def test_parse_docx_reads_text_box_once_after_its_paragraph():
+    text_box = "<w:txbxContent><w:p><w:r><w:t>Python, SQL</w:t></w:r></w:p></w:txbxContent>"
+    body = (
+        "<w:p>"
+        "<w:r><w:t>Name</w:t></w:r>"
+        "<w:r><mc:AlternateContent>"
+        f"<mc:Choice Requires=\"wps\"><w:drawing>{text_box}</w:drawing></mc:Choice>"
+        f"<mc:Fallback><w:pict>{text_box}</w:pict></mc:Fallback>"
+        "</mc:AlternateContent></w:r>"
+        "<w:r><w:t xml:space=\"preserve\"> Smith</w:t></w:r>"
+        "</w:p>"
+    )
+
+    assert parse_docx(build_docx(body)) == "Name Smith\nPython, SQL\n\n"
+
+
+def test_parse_docx_keeps_tables_hyperlinks_and_headers():
+    body = (
+        "<w:p><w:pPr><w:tabs><w:tab w:val=\"left\" w:pos=\"720\"/></w:tabs></w:pPr>"
+        "<w:r><w:t>Skills</w:t><w:tab/><w:t>Audit</w:t></w:r></w:p>"
+        "<w:tbl><w:tr><w:tc><w:p><w:r><w:t>SOX</w:t></w:r></w:p></w:tc></w:tr></w:tbl>"
+    )
+    rels = (
+        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/hyperlink" '
+        'Target="https://linkedin.com/in/jane" TargetMode="External"/>'
+    )
+    header = "<w:p><w:r><w:t>jane@example.com</w:t></w:r></w:p>"
+
+    text = parse_docx(build_docx(body, header=header, rels=rels))
+
+    assert text == "Skills\tAudit\nSOX\nhttps://linkedin.com/in/jane\njane@example.com"
+
+
+def crash_first_parse(marker_path: str, file_buffer: BytesIO) -> str:
+    """
+    Kills its worker process the first time it runs, as a PDFium crash would, and returns the file's text afterwards.
+    """
+    if not os.path.exists(marker_path):
+        open(marker_path, "w").close()
+        os._exit(1)
+    return file_buffer.read().decode("utf-8")
+
+
+def test_parse_many_replaces_a_pool_broken_by_a_dead_worker(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_parser, "_process_pool", None)
+    monkeypatch.setitem(file_parser.PARSERS_BY_EXTENSION, ".pdf", partial(crash_first_parse, str(tmp_path / "crashed")))
+    broken_pool = file_parser._get_process_pool()
+
+    try:
+        assert parse_many([(BytesIO(b"first resume"), "first.pdf")]) == ["first resume"]
+        assert file_parser._process_pool is not broken_pool
+        assert parse_many([(BytesIO(b"second resume"), "second.pdf")]) == ["second resume"]
+    finally:
+        file_parser._get_process_pool().shutdown()
+
+
+class UnreachableRedis:
+    """
+    Redis client whose every call fails, as when the server is down.
+    """
+    def get(self, key):
+        raise ConnectionError("Redis is down")
+
+    def set(self, key, value, ex=None):
+        raise ConnectionError("Redis is down")
+
+
+def test_parse_pdf_or_docx_parses_the_file_when_redis_fails(monkeypatch):
+    monkeypatch.setattr(file_parser, "_get_redis_client", UnreachableRedis)
+
+    text = parse_pdf_or_docx(build_docx("<w:p><w:r><w:t>Jane Smith</w:t></w:r></w:p>"), "resume.docx")
+
+    assert text == "Jane Smith\n\n"
@@ -0,0 +1,69 @@
+from datetime import datetime
+
+from app.services.resume_scoring import ResumeScoringService
+
+
+def build_service() -> ResumeScoringService:
+    """
+    Builds the service without connecting to OpenAI or Neo4j; the experience math needs neither.
+    """
+    return ResumeScoringService.__new__(ResumeScoringService)
+
+
+def months_ago(months: int) -> str:
+    """
+    Returns the first day of the month that lies the given number of months before the current one.
+    """
+    now = datetime.now()
+    year, month = divmod(now.year * 12 + now.month - 1 - months, 12)
+    return f"{year}-{month + 1:02d}-01"
+
+
+def test_overlapping_experiences_count_shared_months_once():
+    experiences = [
+        {"date_start": "2018-07-01", "date_end": "2020-01-01"},
+        {"date_start": "2018-01-01", "date_end": "2019-01-01"},
+    ]
+
+    assert build_service().calculate_total_work_experience(experiences) == {"years": 2, "months": 0}
+
+
+def test_adjacent_and_separate_experiences_are_added():
+    experiences = [
+        {"date_start": "2015-01-01", "date_end": "2016-01-01"},
+        {"date_start": "2016-01-01", "date_end": "2016-07-01"},
+        {"date_start": "2017-01-01", "date_end": "2017-04-01"},
+    ]
+
+    assert build_service().calculate_total_work_experience(experiences) == {"years": 1, "months": 9}
+
+
+def test_experience_ending_before_it_starts_adds_nothing():
+    experiences = [
+        {"date_start": "2020-06-01", "date_end": "2020-01-01"},
+        {"date_start": "2021-01-01", "date_end": "2021-03-01"},
+    ]
+
+    assert build_service().calculate_total_work_experience(experiences) == {"years": 0, "months": 2}
+
+
+def test_present_end_date_counts_up_to_the_current_month():
+    experiences = [{"date_start": months_ago(30), "date_end": "Present"}]
+
+    assert build_service().calculate_total_work_experience(experiences) == {"years": 2, "months": 6}
+
+
+def test_parse_date_reads_the_year_and_month():
+    service = build_service()
+
+    assert service.parse_date("2020-05-17") == 2020 * 12 + 5
+    assert service.parse_date("2020-05") == 2020 * 12 + 5
+    assert service.parse_date("2020-5-1") == 2020 * 12 + 5
+
+
+def test_parse_date_falls_back_to_the_current_month():
+    service = build_service()
+    now = datetime.now()
+
+    for date_string in ("", "Present", "2020-13-01", "2020/05/01"):
+        assert service.parse_date(date_string) == now.year * 12 + now.month